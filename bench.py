@@ -0,0 +1,121 @@
+# bench.py
+#
+# Headless sweep benchmark. Drives full main.py-style sweeps (channel
+# scheduler, run files, batched sheet writes) against MockLCRMeter,
+# MockSheet and MockDAQTask with configurable latencies, then reports
+# points/second, measurement latency and the per-stage timing breakdown.
+# Latency is per point in point-by-point mode and per list transfer
+# ("block") otherwise, where points are not timed individually; use
+# --list-points to shrink the lists and collect more block samples.
+#
+#   python bench.py --sweep LOG --step 50 --channels "1,2;3,4"
+#   python bench.py --no-list --io-latency 0.005 --json bench.json
+#   python bench.py --list-points 10
+
+import argparse
+import json
+import tempfile
+import time
+from config import NUM_PINS, LCR_LIST_MAX_POINTS
+from main import ChannelRecorder
+from mockdaq import MockDAQTask
+from mocklcr import MockLCRMeter
+from mocksheet import MockSheet
+from scheduler import ChannelScheduler
+from sheets import ResultWriter
+from sweepplan import SWEEP_KINDS, SweepPlanner
+from timing import StageTimer
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark sweeps against simulated hardware")
+    parser.add_argument("--sweep", choices=SWEEP_KINDS, default="LOG")
+    parser.add_argument("--start", type=int, default=1000)
+    parser.add_argument("--stop", type=int, default=1000000)
+    parser.add_argument("--step", type=int, default=20,
+                        help="Hz for LIN sweeps, points per decade otherwise")
+    parser.add_argument("--mode", choices=["Z", "R", "C"], default="Z")
+    parser.add_argument("--channels", default="1",
+                        help="pin sets separated by ';', e.g. \"1,2;3,4\"")
+    parser.add_argument("--runs", type=int, default=1, help="sweeps to run back to back")
+    parser.add_argument("--no-list", action="store_true",
+                        help="simulate a meter without list sweep (point-by-point *OPC? mode)")
+    parser.add_argument("--list-points", type=int, default=LCR_LIST_MAX_POINTS,
+                        help="points per uploaded frequency list; fewer gives more block samples")
+    parser.add_argument("--settle-time", type=float, default=0.02, help="LCR settle time per point (s)")
+    parser.add_argument("--point-time", type=float, default=0.01, help="LCR measurement time per point (s)")
+    parser.add_argument("--io-latency", type=float, default=0.002, help="VISA latency per command (s)")
+    parser.add_argument("--sheet-latency", type=float, default=0.2, help="Sheets latency per request (s)")
+    parser.add_argument("--daq-latency", type=float, default=0.001, help="DAQ write latency (s)")
+    parser.add_argument("--relay-settle", type=float, default=0.005, help="relay settling time (s)")
+    parser.add_argument("--json", help="also write the results and stage histograms to this file")
+    return parser.parse_args()
+
+def run_benchmark(args):
+    pin_sets = [list(map(int, group.split(","))) for group in args.channels.split(";") if group.strip()]
+    timer = StageTimer()
+    sheet = MockSheet(latency=args.sheet_latency)
+    writer = ResultWriter(sheet, timer=timer)
+    daq_task = MockDAQTask(NUM_PINS, write_latency=args.daq_latency)
+    lcr = MockLCRMeter(settle_time=args.settle_time, point_time=args.point_time,
+                       io_latency=args.io_latency, list_sweep=not args.no_list)
+    scheduler = ChannelScheduler(daq_task, lcr, settle_time=args.relay_settle, timer=timer,
+                                 list_points=args.list_points)
+
+    row = 10
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as data_dir:
+        for _ in range(args.runs):
+            recorder = ChannelRecorder(writer, row, "BENCH", args.mode, args.sweep,
+                                       data_dir=data_dir, timer=timer, echo=False)
+            scheduler.run(pin_sets, args.mode,
+                          lambda: SweepPlanner(args.sweep, args.start, args.stop, args.step),
+                          recorder)
+            row = recorder.row
+        writer.close()
+    wall = time.perf_counter() - started
+
+    points = row - 10
+    stages = timer.summary()["stages"]
+    latency_stage = "block" if "block" in stages else "point"
+    latency = stages.get(latency_stage, {})
+    per_point = stages.get("block_pt" if latency_stage == "block" else "point", {})
+    return timer, {
+        "points": points,
+        "wall": wall,
+        "points_per_second": points / wall if wall else 0.0,
+        "latency_stage": latency_stage,
+        "latency_count": latency.get("count", 0),
+        "latency_p50": latency.get("p50", 0.0),
+        "latency_p99": latency.get("p99", 0.0),
+        "per_point_p50": per_point.get("p50", 0.0),
+        "per_point_p99": per_point.get("p99", 0.0),
+        "sheet_requests": sheet.request_count,
+        "relay_toggles": daq_task.toggles,
+    }
+
+def main():
+    args = parse_args()
+    timer, results = run_benchmark(args)
+    print(f"points:          {results['points']}")
+    print(f"wall time:       {results['wall']:.3f} s")
+    print(f"throughput:      {results['points_per_second']:.1f} points/s")
+    print(f"{results['latency_stage'] + ' latency:':<17}p50 {results['latency_p50']*1e3:.3f} ms, "
+          f"p99 {results['latency_p99']*1e3:.3f} ms over {results['latency_count']} samples")
+    if results["latency_stage"] == "block":
+        print(f"  per point:     p50 {results['per_point_p50']*1e3:.3f} ms, "
+              f"p99 {results['per_point_p99']*1e3:.3f} ms (block latency / points in block)")
+    print(f"sheet requests:  {results['sheet_requests']}")
+    print(f"relay toggles:   {results['relay_toggles']}")
+    print()
+    print(timer.report())
+
+    if args.json:
+        timer.export(args.json)
+        with open(args.json) as f:
+            exported = json.load(f)
+        exported["benchmark"] = dict(results, args=vars(args))
+        with open(args.json, "w") as f:
+            json.dump(exported, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,41 @@
 
 # Google Sheets
 SPREADSHEET_NAME = "LCR Test Config"
+SHEETS_BATCH_SIZE = 50        # rows per range write
+SHEETS_FLUSH_INTERVAL = 2.0   # seconds before a partial batch is written
+SHEETS_MAX_RETRIES = 5        # attempts per batch when the quota is hit
+SHEETS_RETRY_BACKOFF = 1.0    # initial retry delay in seconds, doubled each attempt
+CONFIG_POLL_INTERVAL = 1.0    # seconds between config reads while active
+CONFIG_POLL_MAX_INTERVAL = 5.0  # idle polling backs off up to this interval
+
+# Run files written while measuring (see runfile.py)
+DATA_DIR = "data"
 
 # Real device VISA resource string
 REAL_DEVICE_RESOURCE = "USB::0x0AAD::0xXXXX::MY12345678::INSTR"  # Update as needed
 
+# Meters driven in parallel by sessions.SessionPool
+LCR_RESOURCES = [REAL_DEVICE_RESOURCE]
+LCR_TIMEOUT = 30.0              # seconds allowed per command or list chunk
+LCR_RECONNECT_ATTEMPTS = 3      # reconnects tried before a command fails
+LCR_RECONNECT_DELAY = 1.0       # seconds between reconnect attempts
+
+# LCR sweep
+LCR_LIST_SWEEP = True        # use the instrument's list sweep when it is available
+LCR_LIST_MAX_POINTS = 201    # points per uploaded frequency list
+
+# Adaptive sweep refinement
+ADAPTIVE_MAX_PASSES = 4      # refinement passes after the coarse log sweep
+ADAPTIVE_MAX_POINTS = 2000   # cap on total points per adaptive sweep
+ADAPTIVE_MAG_TOL = 0.05      # split intervals where |Z| changes by more decades than this
+ADAPTIVE_PHASE_TOL = 10.0    # ... or where the phase changes by more degrees than this
+
 # NI DAQ
 DAQ_DEVICE = "cDAQ1Mod1"  # or Dev1 for USB-6003
 NUM_PINS = 8
+RELAY_SETTLE_TIME = 0.005  # seconds to wait after switching pins before measuring
 
 # Toggle simulation mode
 USE_SIMULATED_LCR = True
+USE_SIMULATED_SHEET = False
+USE_SIMULATED_DAQ = False
@@ -1,14 +1,19 @@
 # daq.py
 
 import nidaqmx
-from config import DAQ_DEVICE, NUM_PINS
+from config import DAQ_DEVICE, NUM_PINS, USE_SIMULATED_DAQ
+from mockdaq import MockDAQTask
 
 def setup_daq():
+    if USE_SIMULATED_DAQ:
+        return MockDAQTask(NUM_PINS)
     task = nidaqmx.Task()
     for i in range(NUM_PINS):
         task.do_channels.add_do_chan(f"{DAQ_DEVICE}/port0/line{i}")
     return task
 
+def pin_states(active_pins):
+    return [i+1 in active_pins for i in range(NUM_PINS)]
+
 def control_pins(task, active_pins):
-    states = [i+1 in active_pins for i in range(NUM_PINS)]
-    task.write(states)
+    task.write(pin_states(active_pins))
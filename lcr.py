@@ -1,15 +1,26 @@
 # lcr.py
 
+import time
 import pyvisa
-from config import USE_SIMULATED_LCR, REAL_DEVICE_RESOURCE
+from config import USE_SIMULATED_LCR, REAL_DEVICE_RESOURCE, LCR_LIST_SWEEP, LCR_LIST_MAX_POINTS
 from mocklcr import MockLCRMeter
+from timing import stage
 
-def connect_lcr():
+FETCH_COMMANDS = {
+    "Z": "FETCH:IMPedance?",
+    "R": "FETCH:RESistance?",
+    "C": "FETCH:CAPacitance?",
+}
+
+# Numbers returned per point by FETCH in each mode ("real,imag" for Z)
+VALUES_PER_POINT = {"Z": 2, "R": 1, "C": 1}
+
+def connect_lcr(resource=REAL_DEVICE_RESOURCE):
     if USE_SIMULATED_LCR:
         return MockLCRMeter()
     else:
         rm = pyvisa.ResourceManager()
-        inst = rm.open_resource(REAL_DEVICE_RESOURCE)
+        inst = rm.open_resource(resource)
         inst.write("*RST")
         return inst
 
@@ -18,10 +29,78 @@ def configure_lcr(inst, mode, freq):
     inst.write(f"FREQ {freq}")
 
 def fetch_measurement(inst, mode):
-    if mode == "Z":
-        return inst.query("FETCH:IMPedance?")
-    elif mode == "R":
-        return inst.query("FETCH:RESistance?")
-    elif mode == "C":
-        return inst.query("FETCH:CAPacitance?")
+    if mode in FETCH_COMMANDS:
+        return inst.query(FETCH_COMMANDS[mode])
     return "0"
+
+def wait_complete(inst):
+    """Block until the pending measurement has settled (*OPC?)."""
+    inst.query("*OPC?")
+
+def split_block(block, mode):
+    """Split a bulk FETCH response into one value string per point."""
+    values = block.strip().split(",")
+    n = VALUES_PER_POINT.get(mode, 1)
+    return [",".join(values[i:i + n]) for i in range(0, len(values), n)]
+
+def sweep_blocks(inst, mode, freqs, timer=None, list_points=LCR_LIST_MAX_POINTS):
+    """Measure `freqs`, yielding (frequencies, raw FETCH block) per transfer.
+
+    The frequency list is uploaded to the instrument's list-sweep subsystem
+    in chunks of `list_points`, triggered once per chunk and read back
+    in a single transfer. If the instrument rejects the LIST commands the
+    remaining points are measured one at a time, waiting on *OPC? rather than
+    a fixed delay.
+
+    With a timing.StageTimer, instrument I/O is recorded as "visa" and waits
+    for the measurement to complete as "settle". The latency of each list
+    transfer, from upload to FETCH, is recorded as "block" and divided by
+    its points as "block_pt"; that of each point measured on its own is
+    recorded as "point".
+    """
+    freqs = list(freqs)
+    with stage(timer, "visa"):
+        inst.write(f"FUNC:IMP {mode}")
+    for i in range(0, len(freqs), list_points):
+        chunk = freqs[i:i + list_points]
+        started = time.perf_counter()
+        if not (LCR_LIST_SWEEP and _load_list(inst, chunk, timer)):
+            yield from _point_sweep(inst, mode, freqs[i:], timer)
+            return
+        block = _run_list(inst, mode, timer)
+        if timer is not None:
+            elapsed = time.perf_counter() - started
+            timer.record("block", elapsed)
+            timer.record("block_pt", elapsed / len(chunk))
+        yield chunk, block
+
+def _load_list(inst, freqs, timer=None):
+    with stage(timer, "visa"):
+        inst.write("*CLS")
+        inst.write("LIST:MODE SEQ")
+        inst.write("LIST:FREQ " + ",".join(str(freq) for freq in freqs))
+        error = inst.query("SYST:ERR?")
+    return error.strip().lstrip("+").startswith("0")
+
+def _run_list(inst, mode, timer=None):
+    with stage(timer, "visa"):
+        inst.write("TRIG:SOUR BUS")
+        inst.write("INIT")
+        inst.write("*TRG")
+    with stage(timer, "settle"):
+        wait_complete(inst)
+    with stage(timer, "visa"):
+        return fetch_measurement(inst, mode)
+
+def _point_sweep(inst, mode, freqs, timer=None):
+    for freq in freqs:
+        started = time.perf_counter()
+        with stage(timer, "visa"):
+            inst.write(f"FREQ {freq}")
+        with stage(timer, "settle"):
+            wait_complete(inst)
+        with stage(timer, "visa"):
+            value = fetch_measurement(inst, mode)
+        if timer is not None:
+            timer.record("point", time.perf_counter() - started)
+        yield [freq], value
@@ -0,0 +1,183 @@
+# liveplot.py
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+COLORS = ['b', 'g', 'r', 'c', 'm']
+
+def decimate_minmax(x, y, bins):
+    """Reduce a curve to at most two points per bin, keeping its envelope.
+
+    Points are sorted by `x` and grouped into `bins` bins spaced evenly in
+    log10(x), matching the semilogx axis; each bin contributes its minimum
+    and maximum `y`. Curves that already fit are only sorted.
+    """
+    order = np.argsort(x, kind="stable")
+    x, y = x[order], y[order]
+    if len(x) <= 2 * bins:
+        return x, y
+    lx = np.log10(x)
+    span = lx[-1] - lx[0] or 1.0
+    index = np.minimum(((lx - lx[0]) / span * bins).astype(int), bins - 1)
+    starts = np.flatnonzero(np.r_[True, index[1:] != index[:-1]])
+    ends = np.r_[starts[1:], len(x)] - 1
+    xs = np.column_stack([x[starts], x[ends]]).ravel()
+    ys = np.column_stack([np.minimum.reduceat(y, starts), np.maximum.reduceat(y, starts)]).ravel()
+    return xs, ys
+
+class LivePlot:
+    """|Z| vs frequency plot embedded in a Tk window.
+
+    Each run is one line. Finished runs are decimated once, when they are
+    passed to `set_runs()`, and drawn into a cached background; `update()`
+    only recomputes the live run's line and blits it over that background,
+    so refreshing does not re-render axes, grid, legend or other runs. Line
+    data is min/max decimated to the axes width in pixels, which keeps the
+    cost of a refresh flat however many points or overlaid runs there are.
+    A full redraw only happens when runs are added or the data leaves the
+    current axis limits.
+    """
+
+    def __init__(self, master):
+        self.figure = Figure(figsize=(6, 4), facecolor="#f0f0f0", tight_layout=True)
+        self.ax = self.figure.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+        self.widget = self.canvas.get_tk_widget()
+        self.runs = []
+        self.lines = []
+        self.live = None
+        self._live_line = None
+        self._bins = None
+        self._static_limits = None
+        self._background = None
+        self._freq_range = None
+        self._saving = False
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self._setup_axes()
+
+    def _setup_axes(self):
+        ax = self.ax
+        ax.set_facecolor("#f8f8f8")
+        ax.set_xscale("log")
+        ax.set_title("Impedance vs Frequency", fontsize=14, pad=20, weight='bold')
+        ax.set_xlabel("Frequency (Hz)", fontsize=12, weight='bold')
+        ax.set_ylabel("|Z| (Ohms)", fontsize=12, weight='bold')
+        ax.grid(True, which='both', linestyle='--', linewidth=0.5, alpha=0.7)
+
+    def set_runs(self, runs, freq_range=None, live=None):
+        """Show `runs` (MeasurementRun objects), replacing the current lines.
+
+        `freq_range` fixes the x axis up front, e.g. to the span of a sweep
+        that has not produced any points yet. `live` is the run in `runs`
+        still being measured, the only one `update()` refreshes.
+        """
+        for line in self.lines:
+            line.remove()
+        self.runs = list(runs)
+        self.lines = [
+            self.ax.plot([], [], label=run.label, color=COLORS[i % len(COLORS)],
+                         linewidth=2, animated=run is live)[0]
+            for i, run in enumerate(self.runs)
+        ]
+        legend = self.ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        if self.lines:
+            legend = self.ax.legend(fontsize=10, framealpha=0.9)
+            for text in legend.get_texts():
+                text.set_weight('bold')
+        self._freq_range = freq_range
+        self.live = live
+        self._live_line = self.lines[self.runs.index(live)] if live is not None else None
+        self._set_data()
+        self._rescale(force=True)
+        self.canvas.draw()
+
+    def update(self):
+        """Refresh the live run's line from its current data."""
+        if self._width() != self._bins:
+            self._set_data()
+        elif self.live is not None:
+            run = self.live
+            self._live_line.set_data(*decimate_minmax(run.frequency, run.magnitude, self._bins))
+        if self._rescale() or self._background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_live()
+        self.canvas.blit(self.ax.bbox)
+
+    def save(self, file_path, **kwargs):
+        """Render the current figure, at full resolution, to `file_path`."""
+        for line, run in zip(self.lines, self.runs):
+            order = np.argsort(run.frequency, kind="stable")
+            line.set_data(run.frequency[order], run.magnitude[order])
+        if self._live_line is not None:
+            self._live_line.set_animated(False)
+        self._saving = True
+        try:
+            self.figure.savefig(file_path, **kwargs)
+        finally:
+            self._saving = False
+            if self._live_line is not None:
+                self._live_line.set_animated(True)
+            self._set_data()
+            self.canvas.draw()
+
+    def _width(self):
+        return max(int(self.ax.bbox.width), 1)
+
+    def _set_data(self):
+        """Decimate every run to the axes width and cache the data limits
+        of the finished ones."""
+        self._bins = self._width()
+        for line, run in zip(self.lines, self.runs):
+            line.set_data(*decimate_minmax(run.frequency, run.magnitude, self._bins))
+        static = [line for line in self.lines if line is not self._live_line]
+        self._static_limits = self._limits(static)
+
+    @staticmethod
+    def _limits(lines):
+        """(x_lo, x_hi, y_lo, y_hi) of the data in `lines`, or None if empty."""
+        lines = [line for line in lines if len(line.get_xdata())]
+        if not lines:
+            return None
+        return (min(np.min(line.get_xdata()) for line in lines),
+                max(np.max(line.get_xdata()) for line in lines),
+                min(np.min(line.get_ydata()) for line in lines),
+                max(np.max(line.get_ydata()) for line in lines))
+
+    def _rescale(self, force=False):
+        """Widen the axis limits to fit the data; True if they changed."""
+        limits = [self._static_limits]
+        if self._live_line is not None:
+            limits.append(self._limits([self._live_line]))
+        limits = [limit for limit in limits if limit is not None]
+        if not limits:
+            return False
+        x_lo = min(limit[0] for limit in limits)
+        x_hi = max(limit[1] for limit in limits)
+        y_lo = min(limit[2] for limit in limits)
+        y_hi = max(limit[3] for limit in limits)
+        if self._freq_range:
+            x_lo = min(x_lo, min(self._freq_range))
+            x_hi = max(x_hi, max(self._freq_range))
+        (cur_x_lo, cur_x_hi), (cur_y_lo, cur_y_hi) = self.ax.get_xlim(), self.ax.get_ylim()
+        if not force and cur_x_lo <= x_lo and x_hi <= cur_x_hi and cur_y_lo <= y_lo and y_hi <= cur_y_hi:
+            return False
+        # Leave headroom so a growing curve does not force a full redraw every update
+        margin = (y_hi - y_lo) * 0.1 or abs(y_hi) * 0.1 or 1.0
+        self.ax.set_xlim(x_lo, x_hi if x_hi > x_lo else x_lo * 10)
+        self.ax.set_ylim(y_lo - margin, y_hi + margin)
+        return True
+
+    def _on_draw(self, event):
+        if self._saving:
+            return
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_live()
+
+    def _draw_live(self):
+        if self._live_line is not None:
+            self.ax.draw_artist(self._live_line)
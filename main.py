@@ -1,38 +1,116 @@
 # main.py
 
-import time
+import os
 from datetime import datetime
-from sheets import connect_sheet, read_config, write_result
-from daq import setup_daq, control_pins
-from lcr import connect_lcr, configure_lcr, fetch_measurement
+from sheets import connect_sheet, ConfigPoller, ResultWriter
+from daq import setup_daq
+from lcr import connect_lcr, split_block
+from store import parse_block
+from sweepplan import SweepPlanner
+from scheduler import ChannelScheduler
+from runfile import RunWriter, new_run_path, timing_path
+from timing import StageTimer, stage
+from config import DATA_DIR
+
+class ChannelRecorder:
+    """Scheduler sink writing each channel to a run file and the sheet.
+
+    Parsing and run-file writes are recorded as "parse" and "disk" on
+    `timer`, if given; `echo` prints every point as it is recorded.
+    """
+
+    def __init__(self, writer, row, dut, mode, sweep_kind, data_dir=DATA_DIR, timer=None, echo=True):
+        self.writer = writer
+        self.row = row
+        self.dut = dut
+        self.mode = mode
+        self.sweep_kind = sweep_kind
+        self.data_dir = data_dir
+        self.timer = timer
+        self.echo = echo
+        self.started = datetime.now()
+        self.run_file = None
+
+    def start_channel(self, pins):
+        metadata = {"dut": self.dut, "mode": self.mode, "pins": pins, "sweep": self.sweep_kind,
+                    "timestamp": self.started.isoformat()}
+        label = f"{self.dut}_pins{'-'.join(map(str, pins))}"
+        self.run_file = RunWriter(new_run_path(self.data_dir, label, self.started), metadata)
+
+    def add_block(self, pins, freqs, block, zs, timestamp):
+        with stage(self.timer, "parse"):
+            if zs is None:
+                zs = parse_block(block, self.mode, freqs)
+            values = split_block(block, self.mode)
+        with stage(self.timer, "disk"):
+            self.run_file.append(freqs, zs, timestamp)
+        timestamp = datetime.fromtimestamp(timestamp).isoformat()
+        for freq, value in zip(freqs, values):
+            self.writer.write(self.row, timestamp, self.dut, freq, value, self.mode, pins)
+            if self.echo:
+                print(f"{pins} {freq} Hz: {value}")
+            self.row += 1
+
+    def export_timing(self):
+        """Write the timer summary next to this run's files."""
+        path = timing_path(new_run_path(self.data_dir, self.dut, self.started))
+        os.makedirs(self.data_dir, exist_ok=True)
+        self.timer.export(path)
+        return path
+
+    def end_channel(self, pins):
+        if self.run_file is not None:
+            self.run_file.close()
+            self.run_file = None
 
 def main():
     print("Starting measurement system...")
     sheet = connect_sheet()
     lcr = connect_lcr()
     daq_task = setup_daq()
+    writer = ResultWriter(sheet)
+    poller = ConfigPoller(sheet)
+    scheduler = ChannelScheduler(daq_task, lcr)
 
     row = 10  # Start writing results here
 
-    while True:
-        trigger, dut, f_start, f_stop, f_step, mode, pins = read_config(sheet)
-
-        if trigger == "run":
-            print("Running measurement...")
-            control_pins(daq_task, pins)
-
-            for freq in range(f_start, f_stop + 1, f_step):
-                configure_lcr(lcr, mode, freq)
-                time.sleep(0.1)
-                value = fetch_measurement(lcr, mode)
-                timestamp = datetime.now().isoformat()
-                write_result(sheet, row, timestamp, dut, freq, value, mode, pins)
-                print(f"{freq} Hz: {value}")
-                row += 1
-
-            sheet.update("A1", "done")
-            print("Measurement complete.")
-        time.sleep(1)
+    try:
+        while True:
+            config = poller.poll()
+            if config is None:
+                poller.wait()
+                continue
+
+            trigger, dut, f_start, f_stop, f_step, mode, sweep_kind, pin_sets = config
+            if trigger == "run":
+                try:
+                    # Fail here, not inside the scheduler, so a bad B4/B6 does not stop polling
+                    SweepPlanner(sweep_kind, f_start, f_stop, f_step)
+                except ValueError as e:
+                    print(f"ERROR: Invalid sweep config: {e}")
+                    sheet.update("A1", f"error: {e}")
+                    poller.reset()
+                    poller.wait()
+                    continue
+
+                print("Running measurement...")
+                timer = StageTimer()
+                scheduler.timer = writer.timer = timer
+                recorder = ChannelRecorder(writer, row, dut, mode, sweep_kind, timer=timer)
+                scheduler.run(pin_sets, mode,
+                              lambda: SweepPlanner(sweep_kind, f_start, f_stop, f_step),
+                              recorder)
+                row = recorder.row
+
+                writer.flush()
+                sheet.update("A1", "done")
+                print("Measurement complete.")
+                print(timer.report())
+                recorder.export_timing()
+                poller.reset()
+            poller.wait()
+    finally:
+        writer.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,28 @@
+# mockdaq.py
+
+import time
+
+class MockDAQTask:
+    """Stand-in for an nidaqmx digital output task.
+
+    Each `write()` takes `write_latency` seconds and is logged in `writes`
+    as (monotonic time, states), and `toggles` counts individual line changes
+    so relay switching and its timing can be checked without NI hardware.
+    """
+
+    def __init__(self, num_lines, write_latency=0.001):
+        self.states = [False] * num_lines
+        self.write_latency = write_latency
+        self.writes = []
+        self.toggles = 0
+
+    def write(self, states):
+        if self.write_latency:
+            time.sleep(self.write_latency)
+        states = list(states)
+        self.toggles += sum(old != new for old, new in zip(self.states, states))
+        self.states = states
+        self.writes.append((time.monotonic(), states))
+
+    def close(self):
+        pass
@@ -1,26 +1,109 @@
 # mocklcr.py
 
+import math
 import random
+import time
 
 class MockLCRMeter:
-    def __init__(self):
+    """Simulated LCR meter.
+
+    Every command costs `io_latency` seconds. Changing the frequency starts a
+    measurement that completes after `settle_time + point_time`; `*OPC?` and
+    FETCH block until it is done, like the real instrument. With `list_sweep`
+    enabled the LIST subsystem is emulated: `*TRG` runs the uploaded list and
+    a single FETCH returns every point, otherwise LIST commands are rejected
+    through the SYST:ERR? queue.
+
+    `disconnect()` makes every later command raise ConnectionError, to
+    exercise reconnect handling.
+
+    Readings come from a series RLC model (`dut_r`, `dut_l`, `dut_c`, resonant
+    near 500 kHz by default) with `noise` relative random error.
+    """
+
+    def __init__(self, settle_time=0.02, point_time=0.01, io_latency=0.002, list_sweep=True,
+                 dut_r=50.0, dut_l=10e-6, dut_c=10e-9, noise=0.01):
         self.freq = 1000
         self.mode = "Z"
+        self.settle_time = settle_time
+        self.point_time = point_time
+        self.io_latency = io_latency
+        self.list_sweep = list_sweep
+        self.dut_r = dut_r
+        self.dut_l = dut_l
+        self.dut_c = dut_c
+        self.noise = noise
+        self.list_freqs = []
+        self.list_results = None
+        self.errors = []
+        self.busy_until = 0.0
+        self.connected = True
+
+    def disconnect(self):
+        self.connected = False
+
+    def close(self):
+        self.connected = False
 
     def write(self, command):
+        self._io()
         if command.startswith("FREQ"):
             self.freq = float(command.split()[1])
+            self.list_results = None
+            self._start(1)
         elif command.startswith("FUNC"):
             self.mode = command.split()[1]
+        elif command == "*CLS":
+            self.errors = []
+        elif command == "*TRG":
+            if self.list_freqs:
+                self.list_results = [self._measure(freq) for freq in self.list_freqs]
+                self._start(len(self.list_freqs))
+        elif command.startswith(("LIST", "TRIG", "INIT")):
+            if not self.list_sweep:
+                self.errors.append('-113,"Undefined header"')
+            elif command.startswith("LIST:FREQ"):
+                self.list_freqs = [float(f) for f in command.split(None, 1)[1].split(",")]
 
     def query(self, command):
+        self._io()
+        if command == "*OPC?":
+            self._wait()
+            return "1"
+        if command == "SYST:ERR?":
+            return self.errors.pop(0) if self.errors else '+0,"No error"'
         if command.startswith("FETCH"):
-            if self.mode == "Z":
-                Z_real = round(random.uniform(10, 100), 2)
-                Z_imag = round(random.uniform(-50, 50), 2)
-                return f"{Z_real},{Z_imag}"
-            elif self.mode == "R":
-                return str(round(random.uniform(5, 100), 2))
-            elif self.mode == "C":
-                return str(round(random.uniform(1e-9, 1e-6), 12))
+            self._wait()
+            if self.list_results is not None:
+                return ",".join(self.list_results)
+            return self._measure(self.freq)
         return "0"
+
+    def _io(self):
+        if not self.connected:
+            raise ConnectionError("Mock LCR meter disconnected")
+        if self.io_latency:
+            time.sleep(self.io_latency)
+
+    def _start(self, points):
+        self.busy_until = time.monotonic() + points * (self.settle_time + self.point_time)
+
+    def _wait(self):
+        remaining = self.busy_until - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def _measure(self, freq):
+        w = 2 * math.pi * freq
+        Z_real = self.dut_r * self._jitter()
+        Z_imag = (w * self.dut_l - 1 / (w * self.dut_c)) * self._jitter()
+        if self.mode == "Z":
+            return f"{Z_real:.6g},{Z_imag:.6g}"
+        elif self.mode == "R":
+            return f"{Z_real:.6g}"
+        elif self.mode == "C":
+            return f"{-1 / (w * Z_imag):.6g}"
+        return "0"
+
+    def _jitter(self):
+        return 1 + random.uniform(-self.noise, self.noise)
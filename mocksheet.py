@@ -0,0 +1,101 @@
+# mocksheet.py
+
+import re
+import threading
+import time
+
+class QuotaExceededError(Exception):
+    """Raised by MockSheet when the simulated request quota is exhausted."""
+    code = 429
+
+class MockCell:
+    def __init__(self, value):
+        self.value = value
+
+class MockSheet:
+    """In-memory stand-in for a gspread worksheet.
+
+    `latency` is added to every request and `quota` limits the number of
+    requests accepted per `quota_window` seconds, so batching and retry
+    behaviour can be exercised without network access.
+    """
+
+    def __init__(self, latency=0.0, quota=None, quota_window=60.0):
+        self.cells = {}
+        self.latency = latency
+        self.quota = quota
+        self.quota_window = quota_window
+        self.request_count = 0
+        self._request_times = []
+        self._lock = threading.Lock()
+
+    def _request(self):
+        with self._lock:
+            now = time.monotonic()
+            if self.quota is not None:
+                self._request_times = [t for t in self._request_times
+                                       if now - t < self.quota_window]
+                if len(self._request_times) >= self.quota:
+                    raise QuotaExceededError("Quota exceeded for write requests")
+                self._request_times.append(now)
+            self.request_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def acell(self, label):
+        self._request()
+        return MockCell(self.cells.get(label.upper(), ""))
+
+    def batch_get(self, ranges):
+        self._request()
+        with self._lock:
+            return [self._get_range(range_name) for range_name in ranges]
+
+    def _get_range(self, range_name):
+        first, _, last = range_name.upper().partition(":")
+        first_col, first_row = _split_label(first)
+        last_col, last_row = _split_label(last or first)
+        rows = []
+        for row in range(first_row, last_row + 1):
+            values = [self.cells.get(f"{_column_letter(col)}{row}", "")
+                      for col in range(first_col, last_col + 1)]
+            while values and values[-1] == "":
+                values.pop()
+            rows.append(values)
+        while rows and not rows[-1]:
+            rows.pop()
+        return rows
+
+    def update(self, range_name, values):
+        self._request()
+        if not isinstance(values, list):
+            values = [[values]]
+        start = range_name.split(":")[0].upper()
+        col, row = _split_label(start)
+        with self._lock:
+            for r, row_values in enumerate(values):
+                for c, value in enumerate(row_values):
+                    self.cells[f"{_column_letter(col + c)}{row + r}"] = value
+
+    def row_values(self, row):
+        """Return the non-empty values of `row`, left to right."""
+        values = []
+        col = 1
+        while f"{_column_letter(col)}{row}" in self.cells:
+            values.append(self.cells[f"{_column_letter(col)}{row}"])
+            col += 1
+        return values
+
+def _split_label(label):
+    letters, digits = re.match(r"([A-Z]+)(\d+)", label).groups()
+    col = 0
+    for ch in letters:
+        col = col * 26 + ord(ch) - ord("A") + 1
+    return col, int(digits)
+
+def _column_letter(col):
+    letters = ""
+    while col:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
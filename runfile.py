@@ -0,0 +1,120 @@
+# runfile.py
+
+import glob
+import json
+import os
+import re
+import struct
+import time
+import numpy as np
+from store import MeasurementRun, export_txt
+
+# File layout: MAGIC, uint32 header length, JSON metadata padded to
+# HEADER_ALIGN bytes, then fixed-size RECORD_DTYPE records appended per point.
+MAGIC = b"ZSCANRUN"
+HEADER_ALIGN = 64
+RECORD_DTYPE = np.dtype([("freq", "<f8"), ("z", "<c16"), ("time", "<f8")])
+EXTENSION = ".zsr"
+
+def new_run_path(directory, dut, when):
+    """Build a file name for a run of `dut` started at datetime `when`.
+
+    Names only resolve to the second; RunWriter adds a suffix if the file
+    already exists.
+    """
+    safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", dut) or "run"
+    return os.path.join(directory, f"{when:%Y%m%d-%H%M%S}_{safe}{EXTENSION}")
+
+def timing_path(run_path):
+    """Path of the timing summary exported alongside a run file."""
+    return os.path.splitext(run_path)[0] + ".timing.json"
+
+class RunWriter:
+    """Appends measured points to a run file as they arrive.
+
+    Each append is flushed, so a run that crashes or is stopped keeps every
+    point written before that. `metadata` (DUT, mode, pins, timestamp, ...)
+    must be JSON serialisable and is stored in the file header. An existing
+    file is never overwritten: if `path` is taken, "_2", "_3", ... is added
+    before the extension, and `self.path` holds the name actually used.
+    """
+
+    def __init__(self, path, metadata):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.count = 0
+        header = json.dumps(metadata).encode()
+        size = len(MAGIC) + 4 + len(header)
+        header += b" " * (-size % HEADER_ALIGN)
+        self._file, self.path = _create(path)
+        self._file.write(MAGIC + struct.pack("<I", len(header)) + header)
+        self._file.flush()
+
+    def append(self, freqs, zs, t=None):
+        records = np.empty(len(freqs), dtype=RECORD_DTYPE)
+        records["freq"] = freqs
+        records["z"] = zs
+        records["time"] = time.time() if t is None else t
+        self._file.write(records.tobytes())
+        self._file.flush()
+        self.count += len(records)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _create(path):
+    """Open a new file at `path`, or at the first free numbered variant."""
+    root, ext = os.path.splitext(path)
+    candidate = path
+    n = 1
+    while True:
+        try:
+            return open(candidate, "xb"), candidate
+        except FileExistsError:
+            n += 1
+            candidate = f"{root}_{n}{ext}"
+
+def _read_header(f):
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a ZSCAN run file")
+    (length,) = struct.unpack("<I", f.read(4))
+    return json.loads(f.read(length)), len(MAGIC) + 4 + length
+
+def read_metadata(path):
+    """Return the metadata of a run file without touching its data."""
+    with open(path, "rb") as f:
+        return _read_header(f)[0]
+
+def load_run(path):
+    """Open a run file as a MeasurementRun backed by a memory map.
+
+    Points are read from disk only when accessed. A trailing partial record
+    left by an interrupted write is ignored.
+    """
+    with open(path, "rb") as f:
+        metadata, offset = _read_header(f)
+    count = (os.path.getsize(path) - offset) // RECORD_DTYPE.itemsize
+    if count:
+        records = np.memmap(path, dtype=RECORD_DTYPE, mode="c", offset=offset, shape=(count,))
+    else:
+        records = np.empty(0, dtype=RECORD_DTYPE)
+    return MeasurementRun.from_arrays(
+        metadata.get("dut", ""), metadata.get("timestamp", ""), metadata.get("mode", "Z"),
+        records["freq"], records["z"], records["time"], metadata
+    )
+
+def open_runs(directory):
+    """Lazily yield every run stored in `directory`, oldest first."""
+    for path in sorted(glob.glob(os.path.join(directory, "*" + EXTENSION))):
+        yield load_run(path)
+
+def convert_to_txt(paths, out_path):
+    """Export run files to the tab-separated text format of the GUI."""
+    export_txt(out_path, [load_run(path) for path in paths])
@@ -0,0 +1,119 @@
+# scheduler.py
+
+import queue
+import threading
+import time
+from config import RELAY_SETTLE_TIME, LCR_LIST_MAX_POINTS
+from daq import control_pins, pin_states
+from lcr import sweep_blocks
+from store import parse_block
+from timing import stage
+
+def relay_toggles(pins_a, pins_b):
+    """Number of DAQ lines that change when switching from `pins_a` to `pins_b`."""
+    return sum(a != b for a, b in zip(pin_states(pins_a), pin_states(pins_b)))
+
+def order_channels(pin_sets, current_pins=()):
+    """Order pin configurations so consecutive ones differ in few lines.
+
+    Greedy nearest neighbour starting from `current_pins`; ties keep the
+    original order.
+    """
+    remaining = list(pin_sets)
+    ordered = []
+    pins = current_pins
+    while remaining:
+        pins = min(remaining, key=lambda candidate: relay_toggles(pins, candidate))
+        remaining.remove(pins)
+        ordered.append(pins)
+    return ordered
+
+class ChannelScheduler:
+    """Sweeps one DUT over several pin configurations back to back.
+
+    Channels are measured in `order_channels()` order. After each switch the
+    scheduler waits `settle_time` for the relays before sweeping. Raw FETCH
+    blocks are handed to `sink` on a background thread, so parsing and
+    writing the results of one channel overlap the measurement of the next.
+
+    `sink` must provide `start_channel(pins)`, `add_block(pins, freqs, block,
+    zs, timestamp)` and `end_channel(pins)`; they are called in measurement
+    order, and `end_channel()` also when a channel's sweep fails. `zs` holds
+    the block's parsed impedances when the planner already needed them
+    (ADAPTIVE sweeps), otherwise None and parsing is left to the sink.
+    Set `timer` to a timing.StageTimer to record pin switching as "relay"
+    along with the instrument stages. `list_points` is the size of each
+    frequency list uploaded to the meter.
+    """
+
+    def __init__(self, daq_task, lcr, settle_time=RELAY_SETTLE_TIME, timer=None,
+                 list_points=LCR_LIST_MAX_POINTS):
+        self.daq_task = daq_task
+        self.lcr = lcr
+        self.settle_time = settle_time
+        self.timer = timer
+        self.list_points = list_points
+        self.current_pins = []
+
+    def switch(self, pins):
+        with stage(self.timer, "relay"):
+            control_pins(self.daq_task, pins)
+            self.current_pins = pins
+            time.sleep(self.settle_time)
+
+    def run(self, pin_sets, mode, make_planner, sink):
+        """Measure every pin set with a fresh planner from `make_planner()`.
+
+        Returns the pin sets in the order they were measured. An exception
+        raised by the sink is re-raised once all channels are done.
+        """
+        blocks = queue.Queue()
+        errors = []
+        worker = threading.Thread(target=self._drain, args=(blocks, sink, errors), daemon=True)
+        worker.start()
+
+        ordered = order_channels(pin_sets, self.current_pins)
+        try:
+            for pins in ordered:
+                self.switch(pins)
+                blocks.put(("start", pins))
+                try:
+                    planner = make_planner()
+                    for freqs in planner:
+                        for chunk, block in sweep_blocks(self.lcr, mode, freqs, self.timer,
+                                                         self.list_points):
+                            zs = None
+                            if planner.kind == "ADAPTIVE":
+                                with stage(self.timer, "parse"):
+                                    zs = parse_block(block, mode, chunk)
+                                for freq, z in zip(chunk, zs):
+                                    planner.add(freq, z)
+                            blocks.put(("block", pins, chunk, block, zs, time.time()))
+                finally:
+                    blocks.put(("end", pins))
+        finally:
+            blocks.put(None)
+            worker.join()
+
+        if errors:
+            raise errors[0]
+        return ordered
+
+    def _drain(self, blocks, sink, errors):
+        while True:
+            item = blocks.get()
+            if item is None:
+                return
+            kind, pins, *args = item
+            if errors and kind == "block":
+                continue
+            try:
+                if kind == "start":
+                    sink.start_channel(pins)
+                elif kind == "block":
+                    sink.add_block(pins, *args)
+                else:
+                    sink.end_channel(pins)
+            except Exception as e:
+                print(f"ERROR: Failed to record pins {pins}: {e}")
+                errors.append(e)
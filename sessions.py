@@ -0,0 +1,209 @@
+# sessions.py
+
+import asyncio
+import contextlib
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import pyvisa
+from config import (LCR_RESOURCES, LCR_LIST_MAX_POINTS, LCR_TIMEOUT,
+                    LCR_RECONNECT_ATTEMPTS, LCR_RECONNECT_DELAY)
+from lcr import connect_lcr, sweep_blocks
+from mocklcr import MockLCRMeter
+
+# Errors after which a session reconnects and retries the command
+RECOVERABLE_ERRORS = (asyncio.TimeoutError, OSError, pyvisa.errors.VisaIOError)
+
+def _ready(inst):
+    pass
+
+def _close(inst):
+    if hasattr(inst, "close"):
+        inst.close()
+
+def _write(inst, command):
+    inst.write(command)
+
+def _query(inst, command):
+    return inst.query(command)
+
+def _sweep_chunk(inst, mode, freqs):
+    return list(sweep_blocks(inst, mode, freqs))
+
+class InstrumentSession:
+    """One LCR meter with its own command queue and worker.
+
+    Commands submitted from any coroutine are executed one at a time on a
+    dedicated thread, so blocking VISA calls never stall the event loop or
+    other meters. A command that times out or fails with an I/O error makes
+    the session close the instrument, reconnect (`connect()` is called
+    again) and retry it; the error is only raised once `reconnect_attempts`
+    reconnects have failed. Connecting in `start()` is retried the same way;
+    a session that still cannot connect keeps the error in `error` instead
+    of raising.
+    """
+
+    def __init__(self, name, connect, timeout=LCR_TIMEOUT,
+                 reconnect_attempts=LCR_RECONNECT_ATTEMPTS, reconnect_delay=LCR_RECONNECT_DELAY):
+        self.name = name
+        self.connect = connect
+        self.timeout = timeout
+        self.reconnect_attempts = reconnect_attempts
+        self.reconnect_delay = reconnect_delay
+        self.inst = None
+        self.reconnects = 0
+        self.error = None
+        self._executor = None
+        self._queue = None
+        self._worker = None
+
+    async def start(self):
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.ensure_future(self._run())
+        try:
+            await self._execute(_ready)
+        except Exception as e:
+            print(f"ERROR: {self.name}: failed to connect: {e}")
+            self.error = e
+
+    async def stop(self):
+        if self._worker is not None:
+            await self._queue.put(None)
+            await self._worker
+            self._worker = None
+        if self.inst is not None:
+            await self._in_thread(_close, self.inst)
+        self._executor.shutdown(wait=False)
+
+    async def submit(self, job):
+        """Queue coroutine function `job` and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((job, future))
+        return await future
+
+    async def write(self, command):
+        return await self.submit(lambda: self._execute(_write, command))
+
+    async def query(self, command):
+        return await self.submit(lambda: self._execute(_query, command))
+
+    async def sweep(self, mode, freqs, on_block=None):
+        """Sweep `freqs`, returning a list of (frequencies, block).
+
+        The sweep runs as one queued job, one list chunk per command, so a
+        reconnect resumes at the chunk that failed. `on_block(session,
+        frequencies, block)` is awaited for every block as it arrives.
+        """
+        freqs = list(freqs)
+
+        async def job():
+            blocks = []
+            for i in range(0, len(freqs), LCR_LIST_MAX_POINTS):
+                chunk = freqs[i:i + LCR_LIST_MAX_POINTS]
+                for chunk_freqs, block in await self._execute(_sweep_chunk, mode, chunk):
+                    blocks.append((chunk_freqs, block))
+                    if on_block is not None:
+                        await on_block(self, chunk_freqs, block)
+            return blocks
+
+        return await self.submit(job)
+
+    async def _run(self):
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            job, future = item
+            try:
+                future.set_result(await job())
+            except Exception as e:
+                future.set_exception(e)
+
+    def _in_thread(self, func, *args):
+        return asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _execute(self, func, *args):
+        for attempt in range(self.reconnect_attempts + 1):
+            try:
+                if self.inst is None:
+                    self.inst = await asyncio.wait_for(self._in_thread(self.connect), self.timeout)
+                return await asyncio.wait_for(self._in_thread(func, self.inst, *args), self.timeout)
+            except RECOVERABLE_ERRORS as e:
+                print(f"ERROR: {self.name}: {type(e).__name__} {e}")
+                if attempt == self.reconnect_attempts:
+                    raise
+                await self._reconnect()
+
+    async def _reconnect(self):
+        """Close the instrument and switch to a fresh thread; the next
+        `_execute()` attempt opens it again."""
+        # The old thread may still be blocked in a timed-out call, so the close
+        # is queued behind it and waited on for at most `timeout`
+        inst, executor = self.inst, self._executor
+        self.inst = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        if inst is not None:
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(asyncio.wrap_future(executor.submit(_close, inst)), self.timeout)
+        executor.shutdown(wait=False)
+        await asyncio.sleep(self.reconnect_delay)
+        self.reconnects += 1
+
+class SessionPool:
+    """Runs sweeps on several instrument sessions concurrently.
+
+    Use as `async with SessionPool(sessions) as pool:`. Results handed to a
+    sink are written one at a time, whatever meter they came from. Session
+    names key the results, so they must be unique.
+    """
+
+    def __init__(self, sessions):
+        self.sessions = list(sessions)
+        names = [session.name for session in self.sessions]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate session names: {', '.join(duplicates)}")
+
+    @classmethod
+    def from_resources(cls, resources=LCR_RESOURCES, **kwargs):
+        return cls(InstrumentSession(resource, functools.partial(connect_lcr, resource), **kwargs)
+                   for resource in resources)
+
+    async def __aenter__(self):
+        await asyncio.gather(*(session.start() for session in self.sessions))
+        return self
+
+    async def __aexit__(self, *exc):
+        await asyncio.gather(*(session.stop() for session in self.sessions))
+
+    async def run_sweeps(self, mode, freqs, sink=None):
+        """Sweep `freqs` on every meter in parallel.
+
+        `sink(name, frequencies, block)` is called for each block on a worker
+        thread, never concurrently. Returns {session name: blocks}, or the
+        exception for a meter that failed to connect or whose sweep failed;
+        other meters carry on.
+        """
+        lock = asyncio.Lock()
+        loop = asyncio.get_running_loop()
+
+        async def record(session, chunk, block):
+            async with lock:
+                await loop.run_in_executor(None, sink, session.name, chunk, block)
+
+        active = [session for session in self.sessions if session.error is None]
+        results = await asyncio.gather(
+            *(session.sweep(mode, freqs, record if sink else None) for session in active),
+            return_exceptions=True
+        )
+        results = dict(zip((session.name for session in active), results))
+        return {session.name: results.get(session.name, session.error) for session in self.sessions}
+
+def mock_pool(count, **meter_options):
+    """SessionPool of `count` MockLCRMeter sessions; `meter_options` (e.g.
+    io_latency, settle_time) are passed to every meter."""
+    return SessionPool(
+        InstrumentSession(f"MOCK{i}", functools.partial(MockLCRMeter, **meter_options),
+                          reconnect_delay=0.0)
+        for i in range(count)
+    )
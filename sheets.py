@@ -1,24 +1,183 @@
 # sheets.py
 
+import queue
+import threading
+import time
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
-from config import SPREADSHEET_NAME
+from config import (SPREADSHEET_NAME, SHEETS_BATCH_SIZE, SHEETS_FLUSH_INTERVAL,
+                    SHEETS_MAX_RETRIES, SHEETS_RETRY_BACKOFF, CONFIG_POLL_INTERVAL,
+                    CONFIG_POLL_MAX_INTERVAL, USE_SIMULATED_SHEET)
+from mocksheet import MockSheet
+from timing import stage
 
 def connect_sheet():
+    if USE_SIMULATED_SHEET:
+        return MockSheet()
     scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
     creds = ServiceAccountCredentials.from_json_keyfile_name("credentials.json", scope)
     client = gspread.authorize(creds)
     return client.open(SPREADSHEET_NAME).sheet1
 
+CONFIG_RANGES = ["A1", "B1:B7"]
+
+def read_config_block(sheet):
+    """Fetch the raw config cells (A1 and B1:B7) in a single request."""
+    trigger_range, param_range = sheet.batch_get(CONFIG_RANGES)
+    trigger = trigger_range[0][0] if trigger_range and trigger_range[0] else ""
+    params = [row[0] if row else "" for row in param_range]
+    params += [""] * (7 - len(params))
+    return tuple(str(value) for value in [trigger] + params)
+
+def parse_config(block):
+    trigger, dut_label, freq_start, freq_stop, freq_step, mode, sweep_kind, pins = block
+    trigger = trigger.strip().lower()
+    dut_label = dut_label.strip()
+    freq_start = int(freq_start)
+    freq_stop = int(freq_stop)
+    freq_step = int(freq_step)
+    mode = mode.strip()
+    sweep_kind = sweep_kind.strip().upper() or "LIN"
+    pin_sets = [list(map(int, group.split(','))) for group in pins.strip().split(';') if group.strip()]
+    if not pin_sets:
+        raise ValueError("No pin sets given in B7")
+    return trigger, dut_label, freq_start, freq_stop, freq_step, mode, sweep_kind, pin_sets
+
 def read_config(sheet):
-    trigger = sheet.acell("A1").value.strip().lower()
-    dut_label = sheet.acell("B1").value.strip()
-    freq_start = int(sheet.acell("B2").value)
-    freq_stop = int(sheet.acell("B3").value)
-    freq_step = int(sheet.acell("B4").value)
-    mode = sheet.acell("B5").value.strip()
-    pins = list(map(int, sheet.acell("B7").value.strip().split(',')))
-    return trigger, dut_label, freq_start, freq_stop, freq_step, mode, pins
-
-def write_result(sheet, row, timestamp, dut, freq, value, mode, pins):
-    sheet.update(f"A{row}", [[timestamp, dut, freq, value, mode, str(pins)]])
+    """Return the run config. B4 is the step in Hz for a LIN sweep (B6) and
+    points per decade for LOG/ADAPTIVE; an empty B6 means LIN. B7 holds one
+    or more pin sets separated by ';', e.g. "1,2;3,4"."""
+    return parse_config(read_config_block(sheet))
+
+class ConfigPoller:
+    """Polls the config block and reports only when it changes.
+
+    `poll()` returns the parsed config the first time and whenever any cell
+    of the block differs from the previous read, otherwise None. Each poll
+    without a change doubles the wait used by `wait()` up to `max_interval`;
+    a change resets it to `interval`.
+    """
+
+    def __init__(self, sheet, interval=CONFIG_POLL_INTERVAL, max_interval=CONFIG_POLL_MAX_INTERVAL):
+        self.sheet = sheet
+        self.interval = interval
+        self.max_interval = max_interval
+        self.current_interval = interval
+        self._last_block = None
+
+    def poll(self):
+        block = read_config_block(self.sheet)
+        if block == self._last_block:
+            self.current_interval = min(self.current_interval * 2, self.max_interval)
+            return None
+        self._last_block = block
+        self.current_interval = self.interval
+        return parse_config(block)
+
+    def reset(self):
+        """Poll at the base interval again, e.g. after a run has finished."""
+        self.current_interval = self.interval
+
+    def wait(self):
+        time.sleep(self.current_interval)
+
+def result_row(timestamp, dut, freq, value, mode, pins):
+    return [timestamp, dut, freq, value, mode, str(pins)]
+
+def _is_quota_error(exc):
+    # gspread.exceptions.APIError and mocksheet.QuotaExceededError both carry the HTTP status
+    return getattr(exc, "code", None) == 429
+
+class ResultWriter:
+    """Buffers result rows and writes them from a background thread.
+
+    Rows are collected until `batch_size` are pending or `flush_interval`
+    seconds have passed since the oldest one was queued, then each block of
+    consecutive rows is sent as a single range update. `write()` never blocks
+    on the network; call `flush()` to wait for everything queued so far and
+    `close()` when the writer is no longer needed. Range updates are recorded
+    as "sheets" on `timer`, if set.
+    """
+
+    def __init__(self, sheet, batch_size=SHEETS_BATCH_SIZE, flush_interval=SHEETS_FLUSH_INTERVAL,
+                 max_retries=SHEETS_MAX_RETRIES, retry_backoff=SHEETS_RETRY_BACKOFF, timer=None):
+        self.sheet = sheet
+        self.timer = timer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.error = None
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, row, timestamp, dut, freq, value, mode, pins):
+        self._queue.put((row, result_row(timestamp, dut, freq, value, mode, pins)))
+
+    def flush(self):
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self):
+        pending = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+
+            if isinstance(item, tuple):
+                if not pending:
+                    deadline = time.monotonic() + self.flush_interval
+                pending.append(item)
+                if len(pending) < self.batch_size:
+                    continue
+
+            if pending:
+                self._write_batch(pending)
+                pending = []
+                deadline = None
+
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is None:
+                return
+
+    def _write_batch(self, rows):
+        rows.sort(key=lambda item: item[0])
+        start = 0
+        for i in range(1, len(rows) + 1):
+            if i == len(rows) or rows[i][0] != rows[i - 1][0] + 1:
+                first, last = rows[start][0], rows[i - 1][0]
+                values = [values for _, values in rows[start:i]]
+                self._update(f"A{first}:F{last}", values)
+                start = i
+
+    def _update(self, range_name, values):
+        delay = self.retry_backoff
+        for attempt in range(self.max_retries):
+            try:
+                with stage(self.timer, "sheets"):
+                    self.sheet.update(range_name, values)
+                return
+            except Exception as e:
+                if not _is_quota_error(e) or attempt == self.max_retries - 1:
+                    print(f"ERROR: Failed to write {range_name}: {e}")
+                    self.error = e
+                    return
+                time.sleep(delay)
+                delay *= 2
@@ -0,0 +1,137 @@
+# store.py
+
+import time
+from datetime import datetime
+import numpy as np
+
+def parse_block(block, mode, freqs):
+    """Parse a bulk FETCH block into complex impedance in one pass.
+
+    `freqs` are the frequencies the block was measured at, needed to
+    convert capacitance.
+    """
+    values = np.array(block.strip().split(","), dtype=float)
+    if mode == "Z":
+        return values[0::2] + 1j * values[1::2]
+    if mode == "C":
+        w = 2 * np.pi * np.asarray(freqs, dtype=float)
+        with np.errstate(divide="ignore"):
+            return 0 - 1j / (w * values)
+    return values.astype(complex)
+
+class MeasurementRun:
+    """Frequency, complex impedance and timestamp arrays for one sweep.
+
+    Storage is preallocated and grows geometrically, so appending points is
+    cheap. |Z|, phase, R, X, C and L are computed from the impedance array
+    on access.
+    """
+
+    def __init__(self, label, timestamp, mode="Z", capacity=0, metadata=None):
+        self.label = label
+        self.timestamp = timestamp
+        self.mode = mode
+        self.metadata = metadata or {}
+        self.size = 0
+        self._freq = np.empty(capacity, dtype=float)
+        self._z = np.empty(capacity, dtype=complex)
+        self._time = np.empty(capacity, dtype=float)
+
+    @classmethod
+    def from_arrays(cls, label, timestamp, mode, freqs, zs, times, metadata=None):
+        """Wrap existing arrays (e.g. memory-mapped) without copying them."""
+        run = cls(label, timestamp, mode, metadata=metadata)
+        run._freq, run._z, run._time = freqs, zs, times
+        run.size = len(freqs)
+        return run
+
+    def __len__(self):
+        return self.size
+
+    def reserve(self, n):
+        """Make room for at least `n` more points."""
+        needed = self.size + n
+        if needed <= len(self._freq):
+            return
+        capacity = max(needed, 2 * len(self._freq))
+        for name in ("_freq", "_z", "_time"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def append(self, freq, z, t=None):
+        self.extend([freq], [z], t)
+
+    def extend(self, freqs, zs, t=None):
+        n = len(freqs)
+        self.reserve(n)
+        end = self.size + n
+        self._freq[self.size:end] = freqs
+        self._z[self.size:end] = zs
+        self._time[self.size:end] = time.time() if t is None else t
+        self.size = end
+
+    def sort(self):
+        """Order the points by frequency (adaptive sweeps add them out of order)."""
+        order = np.argsort(self.frequency, kind="stable")
+        for name in ("_freq", "_z", "_time"):
+            array = getattr(self, name)
+            array[:self.size] = array[:self.size][order]
+
+    @property
+    def frequency(self):
+        return self._freq[:self.size]
+
+    @property
+    def impedance(self):
+        return self._z[:self.size]
+
+    @property
+    def time(self):
+        return self._time[:self.size]
+
+    @property
+    def magnitude(self):
+        return np.abs(self.impedance)
+
+    @property
+    def phase(self):
+        """Phase angle in degrees."""
+        return np.degrees(np.angle(self.impedance))
+
+    @property
+    def resistance(self):
+        return self.impedance.real
+
+    @property
+    def reactance(self):
+        return self.impedance.imag
+
+    @property
+    def capacitance(self):
+        """Series capacitance from the reactance, -1 / (wX)."""
+        with np.errstate(divide="ignore"):
+            return -1 / (2 * np.pi * self.frequency * self.reactance)
+
+    @property
+    def inductance(self):
+        """Series inductance from the reactance, X / w."""
+        return self.reactance / (2 * np.pi * self.frequency)
+
+def export_txt(path, runs):
+    """Write `runs` as tab-separated text, one table per run."""
+    with open(path, "w") as f:
+        f.write("ZSCAN Measurement Data\n")
+        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+
+        for i, run in enumerate(runs):
+            f.write(f"=== Measurement {i+1} ===\n")
+            f.write(f"Type: {run.label}\n")
+            f.write(f"Timestamp: {run.timestamp}\n")
+            columns = np.column_stack([run.frequency, run.magnitude, run.phase,
+                                       run.resistance, run.reactance])
+            np.savetxt(f, columns, fmt=["%.0f", "%.4f", "%.4f", "%.4f", "%.4f"], delimiter="\t",
+                       header="Frequency (Hz)\tImpedance (Ohms)\tPhase (deg)\tR (Ohms)\tX (Ohms)",
+                       comments="")
+            f.write("\n")
@@ -0,0 +1,100 @@
+# sweepplan.py
+
+import cmath
+import math
+from config import ADAPTIVE_MAX_PASSES, ADAPTIVE_MAX_POINTS, ADAPTIVE_MAG_TOL, ADAPTIVE_PHASE_TOL
+
+# LIN: `step` is the spacing in Hz; LOG and ADAPTIVE: `step` is points per decade
+SWEEP_KINDS = ("LIN", "LOG", "ADAPTIVE")
+
+def linear_points(start, stop, step):
+    return list(range(start, stop + 1, step))
+
+def log_points(start, stop, points_per_decade):
+    """Logarithmically spaced whole-Hz frequencies from `start` to `stop`."""
+    n = max(2, math.ceil(math.log10(stop / start) * points_per_decade) + 1)
+    points = [round(start * (stop / start) ** (i / (n - 1))) for i in range(n)]
+    return sorted(set(points))
+
+def refine_points(freqs, values, mag_tol=ADAPTIVE_MAG_TOL, phase_tol=ADAPTIVE_PHASE_TOL):
+    """Return new frequencies between neighbouring points that differ sharply.
+
+    `freqs` must be sorted and `values` holds the complex impedance measured
+    at each of them. An interval is split at its geometric midpoint when |Z|
+    changes by more than `mag_tol` decades or the phase by more than
+    `phase_tol` degrees across it.
+    """
+    points = []
+    for f1, f2, z1, z2 in zip(freqs, freqs[1:], values, values[1:]):
+        mid = round(math.sqrt(f1 * f2))
+        if mid <= f1 or mid >= f2:
+            continue
+        if _mag_change(z1, z2) > mag_tol or _phase_change(z1, z2) > phase_tol:
+            points.append(mid)
+    return points
+
+def _mag_change(z1, z2):
+    if not (abs(z1) and abs(z2)):
+        return math.inf if abs(z1) != abs(z2) else 0.0
+    return abs(math.log10(abs(z2) / abs(z1)))
+
+def _phase_change(z1, z2):
+    diff = abs(math.degrees(cmath.phase(z2) - cmath.phase(z1)))
+    return min(diff, 360 - diff)
+
+class SweepPlanner:
+    """Produces the frequency points of a sweep, one pass at a time.
+
+    Iterating yields lists of frequencies to measure; report each result with
+    `add()` before asking for the next pass. LIN and LOG sweeps have a single
+    pass. ADAPTIVE starts with a log-spaced coarse pass and then adds up to
+    `max_passes` refinement passes around sharp changes in |Z| or phase,
+    stopping early once nothing needs refining or `max_points` is reached.
+    An ADAPTIVE config whose coarse pass alone exceeds `max_points` is
+    rejected with ValueError.
+    """
+
+    def __init__(self, kind, start, stop, step, max_passes=ADAPTIVE_MAX_PASSES,
+                 max_points=ADAPTIVE_MAX_POINTS, mag_tol=ADAPTIVE_MAG_TOL,
+                 phase_tol=ADAPTIVE_PHASE_TOL):
+        self.kind = (kind or "LIN").strip().upper()
+        if self.kind not in SWEEP_KINDS:
+            raise ValueError(f"Unknown sweep kind: {kind}")
+        if not (0 < start < stop):
+            raise ValueError("Start frequency must be less than stop frequency")
+        if step <= 0:
+            raise ValueError("Step must be positive")
+        self.start = start
+        self.stop = stop
+        self.step = step
+        if self.kind == "ADAPTIVE":
+            coarse = len(log_points(start, stop, step))
+            if coarse > max_points:
+                raise ValueError(f"Adaptive coarse pass has {coarse} points, "
+                                 f"more than the {max_points} point cap")
+        self.max_passes = max_passes
+        self.max_points = max_points
+        self.mag_tol = mag_tol
+        self.phase_tol = phase_tol
+        self.results = {}
+
+    def __iter__(self):
+        if self.kind == "LIN":
+            yield linear_points(self.start, self.stop, self.step)
+            return
+        yield log_points(self.start, self.stop, self.step)
+        if self.kind != "ADAPTIVE":
+            return
+        for _ in range(self.max_passes):
+            budget = max(0, self.max_points - len(self.results))
+            if not budget:
+                return
+            freqs = sorted(self.results)
+            points = refine_points(freqs, [self.results[f] for f in freqs],
+                                   self.mag_tol, self.phase_tol)[:budget]
+            if not points:
+                return
+            yield points
+
+    def add(self, freq, z):
+        self.results[freq] = z
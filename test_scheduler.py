@@ -0,0 +1,72 @@
+# test_scheduler.py
+
+import time
+import pytest
+from mockdaq import MockDAQTask
+from mocklcr import MockLCRMeter
+from scheduler import ChannelScheduler, order_channels, relay_toggles
+from sheets import parse_config
+from sweepplan import SweepPlanner
+
+METER = dict(settle_time=0.002, point_time=0.0, io_latency=0.0)
+
+class RecordingSink:
+    """Scheduler sink logging (event, pins, monotonic time)."""
+
+    def __init__(self, block_delay=0.0):
+        self.block_delay = block_delay
+        self.events = []
+
+    def start_channel(self, pins):
+        self.events.append(("start", pins, time.monotonic()))
+
+    def add_block(self, pins, freqs, block, zs, timestamp):
+        time.sleep(self.block_delay)
+        self.events.append(("block", pins, time.monotonic()))
+
+    def end_channel(self, pins):
+        self.events.append(("end", pins, time.monotonic()))
+
+def make_planner():
+    return SweepPlanner("LIN", 1000, 10000, 1000)
+
+def test_channels_are_ordered_to_minimise_toggles():
+    pin_sets = [[1, 2, 3], [8], [1, 2]]
+    ordered = order_channels(pin_sets)
+    assert ordered == [[8], [1, 2], [1, 2, 3]]
+
+    daq_task = MockDAQTask(8, write_latency=0)
+    scheduler = ChannelScheduler(daq_task, MockLCRMeter(**METER), settle_time=0)
+    sink = RecordingSink()
+    assert scheduler.run(pin_sets, "Z", make_planner, sink) == ordered
+    expected = sum(relay_toggles(a, b) for a, b in zip([[]] + ordered, ordered))
+    assert daq_task.toggles == expected == 5
+    assert [pins for event, pins, _ in sink.events if event == "start"] == ordered
+
+def test_channel_is_ended_when_its_sweep_fails():
+    class FailingMeter(MockLCRMeter):
+        def query(self, command):
+            if command.startswith("FETCH"):
+                raise OSError("FETCH failed")
+            return super().query(command)
+
+    scheduler = ChannelScheduler(MockDAQTask(8, write_latency=0), FailingMeter(**METER), settle_time=0)
+    sink = RecordingSink()
+    with pytest.raises(OSError):
+        scheduler.run([[1], [2]], "Z", make_planner, sink)
+    assert [(event, pins) for event, pins, _ in sink.events] == [("start", [1]), ("end", [1])]
+
+def test_recording_overlaps_next_channel():
+    daq_task = MockDAQTask(8, write_latency=0)
+    scheduler = ChannelScheduler(daq_task, MockLCRMeter(**METER), settle_time=0)
+    # Recording a channel takes longer than measuring one
+    sink = RecordingSink(block_delay=0.1)
+    scheduler.run([[1], [2]], "Z", make_planner, sink)
+    switched_to_second = daq_task.writes[1][0]
+    first_recorded = next(t for event, pins, t in sink.events if event == "end" and pins == [1])
+    assert switched_to_second < first_recorded
+
+def test_empty_pin_list_is_rejected():
+    block = ("run", "DUT", "1000", "10000", "1000", "Z", "", " ")
+    with pytest.raises(ValueError):
+        parse_config(block)
@@ -0,0 +1,85 @@
+# test_sessions.py
+
+import asyncio
+import functools
+import threading
+import time
+import pytest
+from mocklcr import MockLCRMeter
+from sessions import InstrumentSession, SessionPool, mock_pool
+
+FREQS = list(range(1000, 11000, 1000))
+METER = dict(settle_time=0.01, point_time=0.0, io_latency=0.001)
+
+def run(pool, sink=None):
+    async def sweep():
+        async with pool:
+            return await pool.run_sweeps("Z", FREQS, sink)
+    return asyncio.run(sweep())
+
+def timed_run(pool):
+    started = time.perf_counter()
+    results = run(pool)
+    return time.perf_counter() - started, results
+
+def session(name, connect):
+    return InstrumentSession(name, connect, timeout=5.0, reconnect_attempts=1, reconnect_delay=0.0)
+
+def test_meters_sweep_in_parallel():
+    single, _ = timed_run(mock_pool(1, **METER))
+    parallel, results = timed_run(mock_pool(4, **METER))
+    assert all(isinstance(blocks, list) for blocks in results.values())
+    assert parallel < single * 1.5
+
+def test_sink_calls_are_serialized():
+    active = []
+    peak = []
+    calls = []
+    lock = threading.Lock()
+
+    def sink(name, freqs, block):
+        with lock:
+            active.append(name)
+            peak.append(len(active))
+        time.sleep(0.002)
+        with lock:
+            active.remove(name)
+            calls.append(name)
+
+    # Without list sweep every point is its own block, so the sink is hit often
+    run(mock_pool(4, list_sweep=False, **METER), sink)
+    assert len(calls) == 4 * len(FREQS)
+    assert max(peak) == 1
+
+def test_failed_meters_do_not_stop_the_others():
+    def unreachable():
+        raise ConnectionError("no such meter")
+
+    def dead_meter():
+        meter = MockLCRMeter(**METER)
+        meter.disconnect()
+        return meter
+
+    healthy = session("OK", functools.partial(MockLCRMeter, **METER))
+    pool = SessionPool([session("UNREACHABLE", unreachable), session("DEAD", dead_meter), healthy])
+    results = run(pool)
+    assert isinstance(results["UNREACHABLE"], ConnectionError)
+    assert isinstance(results["DEAD"], ConnectionError)
+    assert [freq for freqs, _ in results["OK"] for freq in freqs] == FREQS
+
+def test_disconnected_meter_reconnects():
+    flaky = session("FLAKY", functools.partial(MockLCRMeter, **METER))
+    pool = SessionPool([flaky, session("OK", functools.partial(MockLCRMeter, **METER))])
+
+    async def sweep():
+        async with pool:
+            flaky.inst.disconnect()
+            return await pool.run_sweeps("Z", FREQS)
+
+    results = asyncio.run(sweep())
+    assert flaky.reconnects == 1
+    assert all(isinstance(blocks, list) for blocks in results.values())
+
+def test_duplicate_session_names_are_rejected():
+    with pytest.raises(ValueError):
+        SessionPool([session("A", MockLCRMeter), session("A", MockLCRMeter)])
@@ -0,0 +1,58 @@
+# test_sheets.py
+
+import time
+import pytest
+from mocksheet import MockSheet, QuotaExceededError
+from sheets import ResultWriter
+
+def write_rows(writer, rows):
+    for row in rows:
+        writer.write(row, "2024-01-01T00:00:00", "DUT", 1000 * row, f"{row},0", "Z", [1])
+
+def assert_written(sheet, rows):
+    for row in rows:
+        assert sheet.row_values(row)[2:4] == [1000 * row, f"{row},0"]
+
+def test_batches_become_range_writes():
+    sheet = MockSheet()
+    writer = ResultWriter(sheet, batch_size=5, flush_interval=60)
+    write_rows(writer, range(10, 20))
+    writer.flush()
+    assert sheet.request_count == 2
+    assert_written(sheet, range(10, 20))
+    writer.close()
+
+def test_partial_batch_is_flushed_after_interval():
+    sheet = MockSheet()
+    writer = ResultWriter(sheet, batch_size=50, flush_interval=0.1)
+    write_rows(writer, range(10, 13))
+    time.sleep(0.5)
+    assert sheet.request_count == 1
+    assert_written(sheet, range(10, 13))
+    writer.close()
+
+def test_quota_errors_are_retried_with_backoff():
+    sheet = MockSheet(quota=1, quota_window=0.2)
+    writer = ResultWriter(sheet, batch_size=50, flush_interval=60, retry_backoff=0.05)
+    # Two separate row ranges make two requests, the second over quota
+    write_rows(writer, [10, 20])
+    started = time.monotonic()
+    writer.flush()
+    assert time.monotonic() - started >= 0.15
+    assert_written(sheet, [10, 20])
+    writer.close()
+
+def test_quota_error_is_raised_once_retries_run_out():
+    writer = ResultWriter(MockSheet(quota=0), max_retries=3, retry_backoff=0.01)
+    write_rows(writer, [10])
+    with pytest.raises(QuotaExceededError):
+        writer.flush()
+    writer.close()
+
+def test_close_drains_pending_rows():
+    sheet = MockSheet()
+    writer = ResultWriter(sheet, batch_size=50, flush_interval=60)
+    write_rows(writer, range(10, 15))
+    writer.close()
+    assert sheet.request_count == 1
+    assert_written(sheet, range(10, 15))
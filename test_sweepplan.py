@@ -0,0 +1,32 @@
+# test_sweepplan.py
+
+import pytest
+from mocklcr import MockLCRMeter
+from store import parse_block
+from sweepplan import SweepPlanner, log_points
+
+def measure(meter, freq):
+    meter.write(f"FREQ {freq}")
+    return parse_block(meter.query("FETCH:IMPedance?"), "Z", [freq])[0]
+
+def run_planner(planner):
+    meter = MockLCRMeter(settle_time=0, point_time=0, io_latency=0)
+    measured = 0
+    for freqs in planner:
+        for freq in freqs:
+            planner.add(freq, measure(meter, freq))
+        measured += len(freqs)
+    return measured
+
+def test_adaptive_sweep_respects_max_points():
+    planner = SweepPlanner("ADAPTIVE", 1000, 1000000, 500, max_points=2000, mag_tol=1e-4)
+    assert run_planner(planner) == 2000
+
+def test_adaptive_sweep_stops_when_budget_is_used():
+    coarse = len(log_points(1000, 1000000, 20))
+    planner = SweepPlanner("ADAPTIVE", 1000, 1000000, 20, max_points=coarse, mag_tol=1e-4)
+    assert run_planner(planner) == coarse
+
+def test_adaptive_coarse_pass_over_cap_is_rejected():
+    with pytest.raises(ValueError):
+        SweepPlanner("ADAPTIVE", 1000, 1000000, 1000, max_points=2000)
@@ -0,0 +1,98 @@
+# timing.py
+
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+import numpy as np
+
+# Histogram bin edges shared by every stage: 1 us to 100 s, 4 bins per decade
+HISTOGRAM_EDGES = np.logspace(-6, 2, 33)
+
+# Stages that span other stages; reported apart so their totals are not
+# ranked or summed with the stages they contain
+AGGREGATE_STAGES = ("point", "block", "block_pt")
+
+class StageTimer:
+    """Collects wall-clock durations per named stage of a sweep.
+
+    Stages used by the measurement code: "settle" (waiting on *OPC?),
+    "visa" (instrument I/O), "parse", "disk", "sheets", "relay" and "gui",
+    plus the AGGREGATE_STAGES "block" (latency of one list-sweep transfer),
+    "block_pt" (the same divided by its points) and "point" (latency of a
+    point measured on its own).
+    Recording is thread-safe, so background writers can share a timer.
+    """
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        """Add a sample of `seconds` to stage `name`."""
+        with self._lock:
+            self.samples[name].append(seconds)
+
+    def histogram(self, name):
+        """Return (counts, bin edges in seconds) for stage `name`."""
+        counts, _ = np.histogram(self.samples.get(name, []), bins=HISTOGRAM_EDGES)
+        return counts, HISTOGRAM_EDGES
+
+    def summary(self):
+        """Per-stage count, total, mean, p50, p99 and max, in seconds."""
+        with self._lock:
+            samples = {name: np.array(values) for name, values in self.samples.items() if values}
+        stages = {
+            name: {
+                "count": int(len(values)),
+                "total": float(values.sum()),
+                "mean": float(values.mean()),
+                "p50": float(np.percentile(values, 50)),
+                "p99": float(np.percentile(values, 99)),
+                "max": float(values.max()),
+            }
+            for name, values in samples.items()
+        }
+        return {"wall": time.perf_counter() - self.started, "stages": stages}
+
+    def export(self, path):
+        """Write the summary and histograms as JSON."""
+        summary = self.summary()
+        summary["histogram_edges"] = HISTOGRAM_EDGES.tolist()
+        for name, stats in summary["stages"].items():
+            stats["histogram"] = self.histogram(name)[0].tolist()
+        with open(path, "w") as f:
+            json.dump(summary, f, indent=2)
+
+    def report(self):
+        """Format the summary as a text table, slowest total first, with
+        the aggregate stages listed after the stages they span."""
+        summary = self.summary()
+        stages = sorted(summary["stages"].items(), key=lambda item: -item[1]["total"])
+        lines = [f"{'stage':<8} {'count':>7} {'total s':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+        aggregates = [item for item in stages if item[0] in AGGREGATE_STAGES]
+        for name, s in [item for item in stages if item[0] not in AGGREGATE_STAGES]:
+            lines.append(_report_line(name, s))
+        if aggregates:
+            lines.append("aggregates (span the stages above):")
+            lines.extend(_report_line(name, s) for name, s in aggregates)
+        lines.append(f"wall time: {summary['wall']:.3f} s")
+        return "\n".join(lines)
+
+def _report_line(name, s):
+    return (f"{name:<8} {s['count']:>7} {s['total']:>9.3f} {s['p50']*1e3:>9.3f} "
+            f"{s['p99']*1e3:>9.3f} {s['max']*1e3:>9.3f}")
+
+def stage(timer, name):
+    """`timer.stage(name)`, or a no-op when `timer` is None."""
+    return timer.stage(name) if timer is not None else nullcontext()